@@ -8,7 +8,7 @@ building a feedback loop for model improvement.
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, HTTPException, status
 from pydantic import BaseModel, Field
 
 from app.config.logger import logger
@@ -86,6 +86,7 @@ class FeedbackStats(BaseModel):
 @track_metrics('feedback_submission')
 async def submit_feedback(
     request: FeedbackRequest,
+    background_tasks: BackgroundTasks,
 ) -> FeedbackResponse:
     """
     Submit user feedback on ML prediction.
@@ -127,8 +128,9 @@ async def submit_feedback(
     # Initialize feedback service
     feedback_service = FeedbackService(request.user_id)
 
-    # Submit feedback
-    feedback_id = feedback_service.submit_feedback(
+    # Build the record now (assigns the feedback ID) and defer the
+    # disk append until after the response is sent
+    record = feedback_service.build_feedback_record(
         expense_id=request.expense_id,
         merchant=request.merchant,
         amount=request.amount,
@@ -141,6 +143,8 @@ async def submit_feedback(
         actual_category=request.actual_category,
         feedback_notes=request.feedback_notes,
     )
+    background_tasks.add_task(feedback_service.append_record, record)
+    feedback_id = record['feedback_id']
 
     # Generate response message
     if request.feedback_type == 'accepted':
@@ -36,6 +36,36 @@ class RecommendationRequest(BaseModel):
     )
 
 
+class ExpenseItem(BaseModel):
+    """Single expense within a batch recommendation request."""
+
+    merchant: str = Field(..., description='Merchant name')
+    amount: float = Field(..., description='Transaction amount', gt=0)
+    date: str | None = Field(
+        None, description='Transaction date (ISO format)'
+    )
+    notes: str | None = Field(None, description='Optional expense notes')
+    receipt_attached: bool = Field(
+        False, description='Whether receipt is attached'
+    )
+    category: str | None = Field(
+        None, description='Pre-selected category (for validation)'
+    )
+
+
+class BatchRecommendationRequest(BaseModel):
+    """Request for recommendations on a batch of expenses."""
+
+    user_id: str = Field(..., description='User identifier')
+    expenses: List[ExpenseItem] = Field(
+        ..., description='Expenses to categorize', min_length=1,
+        max_length=64,
+    )
+    top_k: int = Field(
+        3, description='Number of category suggestions', ge=1, le=5
+    )
+
+
 class Prediction(BaseModel):
     """Enhanced prediction with confidence and explanation."""
 
@@ -73,6 +103,23 @@ class RecommendationResponse(BaseModel):
     feature_quality: float
 
 
+class BatchItemResult(BaseModel):
+    """Recommendation result for one expense in a batch."""
+
+    predictions: List[Prediction]
+    errors: List[ErrorWarning]
+    cold_start: bool
+    feature_quality: float
+
+
+class BatchRecommendationResponse(BaseModel):
+    """Recommendations for a batch of expenses."""
+
+    user_id: str
+    results: List[BatchItemResult]
+    inference_time_ms: float
+
+
 @router.post(
     '/recommend',
     response_model=RecommendationResponse,
@@ -149,3 +196,80 @@ async def get_recommendations(
         inference_time_ms=prediction_result['inference_time_ms'],
         feature_quality=prediction_result['feature_quality'],
     )
+
+
+@router.post(
+    '/recommend/batch',
+    response_model=BatchRecommendationResponse,
+    status_code=status.HTTP_200_OK,
+)
+@track_metrics('ml_recommendations_batch')
+async def get_batch_recommendations(
+    request: BatchRecommendationRequest,
+) -> BatchRecommendationResponse:
+    """
+    Get recommendations for a batch of expenses in one call.
+
+    Feature engineering and the model forward pass run once over the
+    whole batch, amortizing per-request overhead for clients that
+    categorize many expenses at a time (e.g. imports).
+
+    Args:
+        request: Batch recommendation request
+
+    Returns:
+        Per-expense recommendations with predictions and validations
+    """
+    logger.info(
+        f'Received batch recommendation request for user '
+        f'{request.user_id}: {len(request.expenses)} expenses'
+    )
+
+    # Initialize services once for the whole batch
+    inference_service = InferenceService(request.user_id)
+    error_service = ErrorDetectionService(request.user_id)
+
+    # Load model (will fall back to cold-start if not available)
+    inference_service.load_model()
+
+    batch_result = inference_service.predict_batch(
+        [expense.model_dump() for expense in request.expenses],
+        top_k=request.top_k,
+    )
+
+    results = []
+    for expense, item_result in zip(
+        request.expenses, batch_result['results']
+    ):
+        errors = error_service.detect_errors(
+            merchant=expense.merchant,
+            amount=expense.amount,
+            category=expense.category,
+            date=expense.date,
+            notes=expense.notes,
+            receipt_attached=expense.receipt_attached,
+            user_expense_history=None,  # Would come from database
+        )
+        results.append(
+            BatchItemResult(
+                predictions=[
+                    Prediction(**pred)
+                    for pred in item_result['predictions']
+                ],
+                errors=[ErrorWarning(**err) for err in errors],
+                cold_start=item_result['cold_start'],
+                feature_quality=item_result['feature_quality'],
+            )
+        )
+
+    logger.info(
+        f'Batch recommendation completed for user {request.user_id}: '
+        f'{len(results)} expenses, '
+        f'latency={batch_result["inference_time_ms"]:.1f}ms'
+    )
+
+    return BatchRecommendationResponse(
+        user_id=request.user_id,
+        results=results,
+        inference_time_ms=batch_result['inference_time_ms'],
+    )
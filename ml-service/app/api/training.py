@@ -13,7 +13,7 @@ from app.config.logger import logger
 from app.middleware.metrics import track_metrics
 from app.models.categorizer import ExpenseCategorizer
 from app.models.feature_engineering import FeatureEngineering
-from app.tasks.training_tasks import train_model_async
+from app.tasks.training_tasks import encode_training_payload, train_model_async
 
 router = APIRouter(prefix='/api/training', tags=['training'])
 
@@ -200,13 +200,14 @@ async def train_model_async_endpoint(request: TrainModelRequest) -> Dict[str, An
                 detail=f'Insufficient training data: {len(request.training_data)} samples (minimum: 50)',
             )
 
-        # Convert training data to dicts
+        # Serialize training data as columnar Arrow IPC for the broker
         training_data_dicts = [sample.model_dump() for sample in request.training_data]
+        training_payload = encode_training_payload(training_data_dicts)
 
         # Queue async training task
         task = train_model_async.delay(
             user_id=request.user_id,
-            training_data=training_data_dicts,
+            training_data=training_payload,
             hyperparameters=request.hyperparameters,
             run_name=request.run_name,
         )
@@ -27,7 +27,10 @@ celery_app.conf.update(
     task_time_limit=600,  # 10 minutes
     task_soft_time_limit=540,  # 9 minutes
     worker_prefetch_multiplier=1,
-    worker_max_tasks_per_child=100,
+    # Recycle prefork workers aggressively: training tasks leave cached
+    # pandas/XGBoost state behind, so RSS creeps without a cap
+    worker_max_tasks_per_child=50,
+    worker_max_memory_per_child=1_500_000,  # KB (~1.5 GB)
     result_expires=3600,  # 1 hour
 )
 
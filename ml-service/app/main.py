@@ -1,5 +1,6 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.api import (
     dashboard,
@@ -17,6 +18,9 @@ app = FastAPI(
     description=(
         "Machine Learning service for intelligent expense categorization"
     ),
+    # orjson serializes responses in C, which matters for the nested
+    # dashboard and recommendation payloads
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS for backend and frontend access
@@ -128,6 +128,7 @@ class ExpenseCategorizer:
                 eval_metric='mlogloss',
                 early_stopping_rounds=10,
                 random_state=42,
+                enable_categorical=True,
             )
 
             # Train model with early stopping
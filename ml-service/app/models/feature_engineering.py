@@ -8,6 +8,7 @@ historical behavior patterns.
 
 import re
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 import joblib
@@ -413,6 +414,38 @@ class FeatureEngineering:
         logger.info(f"Feature engineering pipeline loaded from {filepath}")
         return instance
 
+    @classmethod
+    def _user_pipeline_path(cls, user_id: str) -> Path:
+        """Path where a user's fitted pipeline is persisted."""
+        return Path('data') / 'models' / user_id / 'feature_engineer.joblib'
+
+    @classmethod
+    def load_or_new(cls, user_id: str) -> 'FeatureEngineering':
+        """
+        Load the user's persisted pipeline if one exists, else create fresh.
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            Fitted pipeline from disk, or an unfitted instance
+        """
+        filepath = cls._user_pipeline_path(user_id)
+        if filepath.exists():
+            try:
+                return cls.load(str(filepath))
+            except Exception as e:
+                logger.warning(
+                    f"Could not load saved pipeline for user {user_id}: {e}"
+                )
+        return cls(user_id=user_id)
+
+    def save_for_user(self) -> None:
+        """Persist the fitted pipeline to the user's pipeline path."""
+        filepath = self._user_pipeline_path(self.user_id)
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        self.save(str(filepath))
+
     def get_feature_names(self) -> List[str]:
         """
         Get list of feature names generated by pipeline.
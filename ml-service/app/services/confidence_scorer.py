@@ -10,10 +10,54 @@ from typing import Any, Dict, List, Optional
 
 import numpy as np
 import pandas as pd
-from sklearn.calibration import CalibratedClassifierCV
 
 from app.config.logger import logger
 
+# Confidence values are clipped to [0, 1] and reported to two decimals,
+# so single precision is ample and halves the bytes moved on hot paths
+_DTYPE = np.float32
+
+# Confidence-level buckets: np.digitize against these bin edges maps a
+# whole batch of confidences to levels without branching per row
+_BINS = np.array([0.6, 0.8])
+_LEVELS = np.array(['low', 'medium', 'high'])
+
+# Precompiled explanation templates keyed by (confidence level, reason code).
+# Dispatching through this table avoids re-parsing f-strings per prediction.
+_EXPLANATIONS = {
+    ('high', 'model'): (
+        '{pct}% confident - the model is very certain about this prediction'
+    ),
+    ('high', 'features'): (
+        '{pct}% confident - the input data quality is excellent'
+    ),
+    ('high', 'history'): (
+        '{pct}% confident - historically correct {hist_pct}% of the time '
+        'for this category'
+    ),
+    ('high', 'default'): (
+        '{pct}% confident - based on strong prediction signals'
+    ),
+    ('medium', 'features'): (
+        '{pct}% confident - but some expense details are missing'
+    ),
+    ('medium', 'model'): (
+        '{pct}% confident - but this prediction has moderate uncertainty'
+    ),
+    ('medium', 'default'): (
+        '{pct}% confident - with reasonable certainty'
+    ),
+    ('low', 'features'): (
+        'Only {pct}% confident - due to incomplete expense information'
+    ),
+    ('low', 'model'): (
+        'Only {pct}% confident - because this expense is ambiguous'
+    ),
+    ('low', 'default'): (
+        'Only {pct}% confident - limited historical data for this pattern'
+    ),
+}
+
 
 class ConfidenceScorer:
     """
@@ -56,48 +100,81 @@ class ConfidenceScorer:
         Returns:
             Dictionary with confidence score and explanation
         """
-        # 1. Start with model probability
-        confidence = model_probability
-
-        # 2. Adjust for feature quality
-        feature_weight = 0.2
-        confidence = (
-            confidence * (1 - feature_weight)
-            + feature_quality * feature_weight
-        )
-
-        # 3. Adjust for historical accuracy
-        if category in self.historical_accuracy:
-            hist_accuracy = self.historical_accuracy[category]
-            hist_weight = 0.15
-            confidence = (
-                confidence * (1 - hist_weight) + hist_accuracy * hist_weight
-            )
+        # Thin wrapper over the batch path so the confidence arithmetic
+        # lives in one place
+        return self.score_batch(
+            model_probabilities=[model_probability],
+            feature_quality=feature_quality,
+            categories=[category],
+            features=features,
+        )[0]
+
+    def score_batch(
+        self,
+        model_probabilities: List[float],
+        feature_quality: float,
+        categories: List[str],
+        features: pd.DataFrame,
+    ) -> List[Dict[str, Any]]:
+        """
+        Calculate calibrated confidence scores for a batch of predictions.
 
-        # 4. Ensure confidence is between 0 and 1
-        confidence = np.clip(confidence, 0.0, 1.0)
+        The confidence arithmetic runs vectorized over the whole batch;
+        only the explanation strings are generated per row.
 
-        # 5. Determine confidence level
-        confidence_level = self._get_confidence_level(confidence)
+        Args:
+            model_probabilities: Raw model probabilities (0-1)
+            feature_quality: Feature completeness score (0-1)
+            categories: Predicted category per probability
+            features: Input features for the predictions
 
-        # 6. Generate explanation
-        explanation = self._generate_explanation(
-            confidence, model_probability, feature_quality, category
+        Returns:
+            List of confidence dictionaries, one per prediction
+        """
+        probs = np.asarray(model_probabilities, dtype=_DTYPE)
+        quality = _DTYPE(feature_quality)
+
+        feature_weight = _DTYPE(0.2)
+        confidences = probs * (1 - feature_weight) + quality * feature_weight
+
+        hist = np.array(
+            [
+                self.historical_accuracy.get(category, np.nan)
+                for category in categories
+            ],
+            dtype=_DTYPE,
         )
-
-        return {
-            'confidence': float(confidence),
-            'confidence_pct': float(confidence * 100),
-            'confidence_level': confidence_level,
-            'explanation': explanation,
-            'factors': {
-                'model_probability': float(model_probability),
-                'feature_quality': float(feature_quality),
-                'historical_accuracy': self.historical_accuracy.get(
-                    category, None
+        hist_weight = _DTYPE(0.15)
+        confidences = np.where(
+            np.isnan(hist),
+            confidences,
+            confidences * (1 - hist_weight) + hist * hist_weight,
+        )
+        confidences = np.clip(confidences, 0.0, 1.0)
+
+        # Branchless level classification for the whole batch
+        levels = _LEVELS[np.digitize(confidences, _BINS)]
+
+        return [
+            {
+                'confidence': float(confidence),
+                'confidence_pct': float(confidence * 100),
+                'confidence_level': str(level),
+                'explanation': self._generate_explanation(
+                    confidence, probability, feature_quality, category, level
                 ),
-            },
-        }
+                'factors': {
+                    'model_probability': float(probability),
+                    'feature_quality': float(feature_quality),
+                    'historical_accuracy': self.historical_accuracy.get(
+                        category, None
+                    ),
+                },
+            }
+            for confidence, probability, category, level in zip(
+                confidences, probs, categories, levels
+            )
+        ]
 
     def assess_feature_quality(self, features: pd.DataFrame) -> float:
         """
@@ -112,16 +189,24 @@ class ConfidenceScorer:
         if len(features) == 0:
             return 0.0
 
-        # Count missing values
-        missing_ratio = features.isnull().sum().sum() / (
-            features.shape[0] * features.shape[1]
-        )
+        # Convert once, then run every reduction as ufunc passes over
+        # the raw array -- no pandas dispatch on this per-request path
+        arr = features.to_numpy(dtype=_DTYPE)
+        nan_mask = np.isnan(arr)
 
         # Penalize missing values
+        missing_ratio = float(nan_mask.mean())
         completeness = 1.0 - missing_ratio
 
-        # Check for zero variance features
-        zero_var_ratio = (features.std() == 0).sum() / len(features.columns)
+        # Check for zero variance features, matching pandas' skipna and
+        # ddof=1 semantics: a column only counts as zero-variance when
+        # it has at least two valid values and they are all equal
+        valid_counts = (~nan_mask).sum(axis=0)
+        col_min = np.where(nan_mask, np.inf, arr).min(axis=0)
+        col_max = np.where(nan_mask, -np.inf, arr).max(axis=0)
+        zero_var_ratio = float(
+            ((valid_counts >= 2) & (col_max == col_min)).mean()
+        )
 
         # Feature diversity score
         diversity = 1.0 - zero_var_ratio
@@ -156,29 +241,13 @@ class ConfidenceScorer:
             f'{self.historical_accuracy[category]:.3f}'
         )
 
-    def _get_confidence_level(self, confidence: float) -> str:
-        """
-        Get confidence level bucket.
-
-        Args:
-            confidence: Confidence score (0-1)
-
-        Returns:
-            Confidence level: 'high', 'medium', or 'low'
-        """
-        if confidence >= 0.8:
-            return 'high'
-        elif confidence >= 0.6:
-            return 'medium'
-        else:
-            return 'low'
-
     def _generate_explanation(
         self,
         final_confidence: float,
         model_prob: float,
         feature_quality: float,
         category: str,
+        level: Optional[str] = None,
     ) -> str:
         """
         Generate human-readable confidence explanation.
@@ -188,47 +257,40 @@ class ConfidenceScorer:
             model_prob: Model probability
             feature_quality: Feature quality score
             category: Predicted category
+            level: Confidence level bucket, if already classified
 
         Returns:
             Explanation string
         """
-        level = self._get_confidence_level(final_confidence)
+        if level is None:
+            level = str(_LEVELS[np.digitize(final_confidence, _BINS)])
+        hist_pct = None
 
         if level == 'high':
-            base = f'{int(final_confidence * 100)}% confident'
             if model_prob > 0.85:
-                reason = 'the model is very certain about this prediction'
+                reason = 'model'
             elif feature_quality > 0.9:
-                reason = 'the input data quality is excellent'
+                reason = 'features'
             elif category in self.historical_accuracy:
+                reason = 'history'
                 hist_pct = int(self.historical_accuracy[category] * 100)
-                reason = (
-                    f'historically correct {hist_pct}% of the time '
-                    f'for this category'
-                )
             else:
-                reason = 'based on strong prediction signals'
-
-            return f'{base} - {reason}'
-
+                reason = 'default'
         elif level == 'medium':
-            base = f'{int(final_confidence * 100)}% confident'
             if feature_quality < 0.7:
-                reason = 'but some expense details are missing'
+                reason = 'features'
             elif model_prob < 0.7:
-                reason = 'but this prediction has moderate uncertainty'
+                reason = 'model'
             else:
-                reason = 'with reasonable certainty'
-
-            return f'{base} - {reason}'
-
+                reason = 'default'
         else:  # low
-            base = f'Only {int(final_confidence * 100)}% confident'
             if feature_quality < 0.5:
-                reason = 'due to incomplete expense information'
+                reason = 'features'
             elif model_prob < 0.5:
-                reason = 'because this expense is ambiguous'
+                reason = 'model'
             else:
-                reason = 'limited historical data for this pattern'
+                reason = 'default'
 
-            return f'{base} - {reason}'
+        return _EXPLANATIONS[(level, reason)].format(
+            pct=int(final_confidence * 100), hist_pct=hist_pct
+        )
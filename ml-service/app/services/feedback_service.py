@@ -4,17 +4,29 @@ Feedback service for collecting and managing user feedback.
 Stores feedback for continuous learning and model improvement.
 """
 
-import json
-import uuid
-from collections import Counter, defaultdict
+from collections import Counter
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
-import pandas as pd
+import numpy as np
+import orjson
+import uuid_utils
+from pyarrow import json as pa_json
 
 from app.config.logger import logger
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Parse cache shared across service instances (one is constructed per
+# request): path -> (mtime_ns, size, parsed_offset, records)
+_parse_cache: Dict[str, tuple] = {}
+
+# Feedback types as small integer codes so the stats reductions run as
+# bincount kernels over contiguous arrays; 3 catches unknown types
+_TYPE_CODES = {'accepted': 0, 'corrected': 1, 'rejected': 2}
+
 
 class FeedbackService:
     """
@@ -39,6 +51,7 @@ class FeedbackService:
         )
         self.feedback_dir.mkdir(parents=True, exist_ok=True)
         self.feedback_file = self.feedback_dir / 'feedback.jsonl'
+        self._append_handle: Optional[Any] = None
 
     def submit_feedback(
         self,
@@ -73,7 +86,51 @@ class FeedbackService:
         Returns:
             Feedback ID
         """
-        feedback_id = str(uuid.uuid4())
+        record = self.build_feedback_record(
+            expense_id=expense_id,
+            merchant=merchant,
+            amount=amount,
+            date=date,
+            notes=notes,
+            predicted_category=predicted_category,
+            confidence=confidence,
+            model_version=model_version,
+            feedback_type=feedback_type,
+            actual_category=actual_category,
+            feedback_notes=feedback_notes,
+        )
+        self.append_record(record)
+        return record['feedback_id']
+
+    def build_feedback_record(
+        self,
+        expense_id: str,
+        merchant: str,
+        amount: float,
+        date: str,
+        notes: Optional[str],
+        predicted_category: str,
+        confidence: float,
+        model_version: Optional[str],
+        feedback_type: str,
+        actual_category: Optional[str] = None,
+        feedback_notes: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Build a feedback record without writing it.
+
+        Lets callers assign the feedback ID synchronously and defer the
+        disk append (e.g. to a background task).
+
+        Args:
+            Same as submit_feedback.
+
+        Returns:
+            Complete feedback record dictionary
+        """
+        # uuid7 IDs sort by creation time, matching the append order of
+        # the log, so readers can rely on file order being time order
+        feedback_id = str(uuid_utils.uuid7())
         timestamp = datetime.now().isoformat()
 
         # Determine if prediction was correct
@@ -107,15 +164,75 @@ class FeedbackService:
             'feedback_notes': feedback_notes,
         }
 
-        # Append to JSONL file
-        with open(self.feedback_file, 'a') as f:
-            f.write(json.dumps(feedback_record) + '\n')
+        return feedback_record
+
+    def append_record(self, record: Dict[str, Any]) -> None:
+        """
+        Append a feedback record to the JSONL log.
+
+        Args:
+            record: Record from build_feedback_record
+        """
+        # orjson serializes straight to bytes and the append handle is
+        # kept open across submissions
+        if self._append_handle is None:
+            self._append_handle = open(self.feedback_file, 'ab')
+        self._append_handle.write(
+            orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+        )
+        self._append_handle.flush()
+
+        logger.info(
+            f'Feedback stored: {record["feedback_id"]} '
+            f'for user {self.user_id}'
+        )
+
+    def append_records(self, records: List[Dict[str, Any]]) -> None:
+        """
+        Append many feedback records with a single write and flush.
+
+        Joining the serialized lines first turns N write syscalls into
+        one, which matters when feedback arrives in bulk (e.g. imports).
+
+        Args:
+            records: Records from build_feedback_record
+        """
+        if not records:
+            return
+        if self._append_handle is None:
+            self._append_handle = open(self.feedback_file, 'ab')
+        self._append_handle.write(
+            b''.join(
+                orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+                for record in records
+            )
+        )
+        self._append_handle.flush()
 
         logger.info(
-            f'Feedback stored: {feedback_id} for user {self.user_id}'
+            f'{len(records)} feedback records stored '
+            f'for user {self.user_id}'
         )
 
-        return feedback_id
+    def submit_feedback_batch(
+        self, submissions: List[Dict[str, Any]]
+    ) -> List[str]:
+        """
+        Submit a batch of feedback entries in one disk write.
+
+        Args:
+            submissions: List of keyword dicts accepted by
+                build_feedback_record
+
+        Returns:
+            Feedback IDs in submission order
+        """
+        records = [
+            self.build_feedback_record(**submission)
+            for submission in submissions
+        ]
+        self.append_records(records)
+        return [record['feedback_id'] for record in records]
 
     def get_feedback_stats(self) -> Dict[str, Any]:
         """
@@ -127,83 +244,95 @@ class FeedbackService:
         if not self.feedback_file.exists():
             return self._empty_stats()
 
-        # Load all feedback
-        feedback_records = self._load_feedback()
-
-        if len(feedback_records) == 0:
+        # Single streaming pass collects codes, confidences, and
+        # timestamps; the numeric reductions then run as bincount
+        # kernels over contiguous arrays instead of per-record branches
+        type_codes: List[int] = []
+        confidences: List[float] = []
+        corrections: Counter = Counter()
+        timestamps: List[str] = []
+
+        for record in self._load_feedback():
+            feedback_type = record['feedback_type']
+            type_codes.append(_TYPE_CODES.get(feedback_type, 3))
+            confidences.append(record.get('confidence') or 0.0)
+            timestamps.append(record['timestamp'])
+
+            if feedback_type == 'corrected':
+                corrections[
+                    (
+                        record['predicted_category'],
+                        record['actual_category'],
+                    )
+                ] += 1
+
+        total = len(type_codes)
+        if total == 0:
             return self._empty_stats()
 
-        df = pd.DataFrame(feedback_records)
-
-        # Calculate stats
-        total = len(df)
-        accepted = len(df[df['feedback_type'] == 'accepted'])
-        corrected = len(df[df['feedback_type'] == 'corrected'])
-        rejected = len(df[df['feedback_type'] == 'rejected'])
-
-        acceptance_rate = (
-            (accepted / total * 100) if total > 0 else 0.0
+        codes = np.asarray(type_codes, dtype=np.int8)
+        counts = np.bincount(codes, minlength=4)
+        conf_sums = np.bincount(
+            codes, weights=confidences, minlength=4
         )
 
-        # Average confidence by feedback type
-        accepted_df = df[df['feedback_type'] == 'accepted']
-        corrected_df = df[df['feedback_type'] == 'corrected']
+        accepted = int(counts[0])
+        corrected = int(counts[1])
+        rejected = int(counts[2])
+
+        acceptance_rate = accepted / total * 100
 
         avg_conf_accepted = (
-            float(accepted_df['confidence'].mean())
-            if len(accepted_df) > 0
-            else 0.0
+            float(conf_sums[0]) / accepted if accepted > 0 else 0.0
         )
         avg_conf_corrected = (
-            float(corrected_df['confidence'].mean())
-            if len(corrected_df) > 0
-            else 0.0
+            float(conf_sums[1]) / corrected if corrected > 0 else 0.0
         )
 
-        # Most corrected categories
-        if len(corrected_df) > 0:
-            corrections = Counter(
-                zip(
-                    corrected_df['predicted_category'],
-                    corrected_df['actual_category'],
-                )
-            )
-            most_corrected = [
-                {
-                    'predicted': pred,
-                    'actual': actual,
-                    'count': count,
-                }
-                for (pred, actual), count in corrections.most_common(5)
-            ]
-        else:
-            most_corrected = []
-
-        # Feedback trend (last 30 days)
-        df['date_parsed'] = pd.to_datetime(df['timestamp'])
-        cutoff = datetime.now() - timedelta(days=30)
-        recent = df[df['date_parsed'] >= cutoff]
+        most_corrected = [
+            {
+                'predicted': pred,
+                'actual': actual,
+                'count': count,
+            }
+            for (pred, actual), count in corrections.most_common(5)
+        ]
+
+        # Feedback trend (last 30 days, grouped by ISO week): two
+        # bincount passes over the week indices instead of a groupby
+        parsed = np.array(timestamps, dtype='datetime64[s]')
+        cutoff = np.datetime64(datetime.now() - timedelta(days=30), 's')
+        recent_mask = parsed >= cutoff
 
-        # Group by week
-        recent['week'] = recent['date_parsed'].dt.isocalendar().week
         trend_data = []
-        for week, group in recent.groupby('week'):
-            week_total = len(group)
-            week_accepted = len(
-                group[group['feedback_type'] == 'accepted']
-            )
-            trend_data.append(
-                {
-                    'week': int(week),
-                    'total': week_total,
-                    'accepted': week_accepted,
-                    'acceptance_rate': (
-                        week_accepted / week_total * 100
-                        if week_total > 0
-                        else 0.0
-                    ),
-                }
-            )
+        if recent_mask.any():
+            # Monday-aligned week buckets from pure int64 math; the
+            # epoch shift (345600s) makes 1970-01-05, a Monday, week 0
+            seconds = parsed[recent_mask].view('i8')
+            week_idx = (seconds - 345_600) // 604_800
+            base_week = week_idx.min()
+            week_idx -= base_week
+
+            accepted_recent = (codes == 0)[recent_mask]
+            week_totals = np.bincount(week_idx)
+            week_accepted = np.bincount(week_idx, weights=accepted_recent)
+            for offset in np.flatnonzero(week_totals):
+                # ISO week label from the bucket's Monday (O(#weeks));
+                # stay in the naive domain the buckets were computed in
+                # rather than fromtimestamp, which applies the local TZ
+                monday = datetime(1970, 1, 5) + timedelta(
+                    weeks=int(base_week + offset)
+                )
+                week_total = int(week_totals[offset])
+                week_acc = int(week_accepted[offset])
+                trend_data.append(
+                    {
+                        'week': monday.isocalendar()[1],
+                        'total': week_total,
+                        'accepted': week_acc,
+                        'acceptance_rate': week_acc / week_total * 100,
+                    }
+                )
 
         return {
             'user_id': self.user_id,
@@ -233,18 +362,29 @@ class FeedbackService:
         if not self.feedback_file.exists():
             return []
 
-        feedback_records = self._load_feedback()
-
-        # Sort by timestamp descending
-        feedback_records.sort(
-            key=lambda x: x['timestamp'], reverse=True
-        )
-
-        return feedback_records[:limit]
+        # The log is append-only in time order, so the newest records
+        # are the last lines: read just enough tail bytes, growing the
+        # window if the size estimate undershoots. O(limit), no full
+        # parse and no sort.
+        with open(self.feedback_file, 'rb') as f:
+            f.seek(0, 2)
+            size = f.tell()
+            back = min(size, limit * 512)
+            while True:
+                f.seek(size - back)
+                lines = f.read().split(b'\n')
+                if back < size:
+                    lines = lines[1:]  # drop the partial first line
+                lines = [line for line in lines if line.strip()]
+                if len(lines) >= limit or back == size:
+                    break
+                back = min(size, back * 2)
+
+        return [orjson.loads(line) for line in reversed(lines[-limit:])]
 
     def get_training_data(
         self, min_confidence: float = 0.0
-    ) -> pd.DataFrame:
+    ) -> 'pd.DataFrame':
         """
         Get feedback as training data for model retraining.
 
@@ -254,11 +394,28 @@ class FeedbackService:
         Returns:
             DataFrame of training samples
         """
+        # Deferred so feedback-only endpoints never pay the pandas
+        # import at worker startup
+        import pandas as pd
+
         if not self.feedback_file.exists():
             return pd.DataFrame()
 
-        feedback_records = self._load_feedback()
-        df = pd.DataFrame(feedback_records)
+        # Columnar read: Arrow's C++ JSONL parser materializes only the
+        # columns training needs as typed arrays (no per-record dicts)
+        table = pa_json.read_json(self.feedback_file).select(
+            [
+                'merchant',
+                'amount',
+                'date',
+                'notes',
+                'actual_category',
+                'timestamp',
+                'is_correct',
+                'confidence',
+            ]
+        )
+        df = table.to_pandas()
 
         if len(df) == 0:
             return pd.DataFrame()
@@ -269,24 +426,19 @@ class FeedbackService:
         # Use actual_category as label
         df = df[df['actual_category'].notna()]
 
-        # Select relevant columns for training
-        training_df = df[
-            [
-                'merchant',
-                'amount',
-                'date',
-                'notes',
-                'actual_category',
-                'timestamp',
-                'is_correct',
-            ]
-        ].copy()
+        training_df = df.drop(columns=['confidence'])
 
         # Rename for consistency
         training_df = training_df.rename(
             columns={'actual_category': 'category'}
         )
 
+        # Labels repeat heavily; categorical codes cut memory and make
+        # downstream comparisons int8 equality instead of string hashing
+        training_df['category'] = training_df['category'].astype(
+            'category'
+        )
+
         logger.info(
             f'Extracted {len(training_df)} training samples '
             f'from feedback for user {self.user_id}'
@@ -294,18 +446,63 @@ class FeedbackService:
 
         return training_df
 
+    def _iter_feedback(self):
+        """
+        Stream feedback records from the JSONL file one at a time.
+
+        Yields:
+            Feedback record dictionaries
+        """
+        # Binary mode: orjson takes bytes directly, skipping the str
+        # decode stdlib json would need
+        with open(self.feedback_file, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    yield orjson.loads(line)
+
     def _load_feedback(self) -> List[Dict[str, Any]]:
         """
         Load all feedback records from JSONL file.
 
+        The parsed records are cached per path against the file's mtime
+        and size. Because the log is append-only, a grown file only has
+        its new tail bytes parsed; a full re-parse happens only when the
+        file shrank or was replaced.
+
         Returns:
             List of feedback records
         """
-        records = []
-        with open(self.feedback_file, 'r') as f:
-            for line in f:
-                if line.strip():
-                    records.append(json.loads(line))
+        stat = self.feedback_file.stat()
+        path = str(self.feedback_file)
+        cached = _parse_cache.get(path)
+
+        if cached is not None:
+            mtime_ns, size, offset, records = cached
+            if (stat.st_mtime_ns, stat.st_size) == (mtime_ns, size):
+                return records
+            if stat.st_size > offset:
+                # Append-only growth: parse just the new tail bytes
+                with open(self.feedback_file, 'rb') as f:
+                    f.seek(offset)
+                    tail = f.read()
+                for line in tail.split(b'\n'):
+                    if line.strip():
+                        records.append(orjson.loads(line))
+                _parse_cache[path] = (
+                    stat.st_mtime_ns,
+                    stat.st_size,
+                    offset + len(tail),
+                    records,
+                )
+                return records
+
+        records = list(self._iter_feedback())
+        _parse_cache[path] = (
+            stat.st_mtime_ns,
+            stat.st_size,
+            stat.st_size,
+            records,
+        )
         return records
 
     def _empty_stats(self) -> Dict[str, Any]:
@@ -330,6 +527,10 @@ class FeedbackService:
 
     def clear_feedback(self) -> None:
         """Clear all feedback for user (for testing)."""
+        if self._append_handle is not None:
+            self._append_handle.close()
+            self._append_handle = None
+        _parse_cache.pop(str(self.feedback_file), None)
         if self.feedback_file.exists():
             self.feedback_file.unlink()
         logger.info(f'Cleared feedback for user {self.user_id}')
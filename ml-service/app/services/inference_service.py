@@ -3,11 +3,15 @@ Unified inference service that combines ML predictions, confidence scoring,
 and explainable AI.
 """
 
+import re
+import threading
 import time
 from datetime import datetime
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
 import pandas as pd
+from cachetools import TTLCache
 
 from app.config.logger import logger
 from app.models.categorizer import ExpenseCategorizer
@@ -15,6 +19,116 @@ from app.models.feature_engineering import FeatureEngineering
 from app.services.confidence_scorer import ConfidenceScorer
 from app.services.explainer import ExplainableAI
 
+# Cold-start keyword table compiled into a single alternation pattern:
+# one C-level scan of the merchant name replaces per-keyword loops
+_COLD_START_KEYWORDS = {
+    'restaurant': ('Food & Dining', 0.75),
+    'cafe': ('Food & Dining', 0.75),
+    'coffee': ('Food & Dining', 0.75),
+    'pizza': ('Food & Dining', 0.75),
+    'grocery': ('Groceries', 0.80),
+    'market': ('Groceries', 0.80),
+    'supermarket': ('Groceries', 0.80),
+    'uber': ('Transportation', 0.75),
+    'lyft': ('Transportation', 0.75),
+    'taxi': ('Transportation', 0.75),
+    'parking': ('Transportation', 0.75),
+}
+_COLD_START_PATTERN = re.compile(
+    '|'.join(sorted(_COLD_START_KEYWORDS, key=len, reverse=True))
+)
+
+
+# Process-wide model cache keyed by (user_id, version, stage). TTL
+# eviction releases booster memory for users who stop sending traffic,
+# so long-running workers don't accumulate one model per user forever.
+# The cache lock only guards dict access; per-key load locks serialize
+# duplicate cold loads without stalling other users' requests
+_model_cache: TTLCache = TTLCache(maxsize=256, ttl=600)
+_model_cache_lock = threading.RLock()
+_model_load_locks: Dict[tuple, threading.Lock] = {}
+
+
+def _load_model_cached(
+    user_id: str, version: Optional[int], stage: str
+) -> ExpenseCategorizer:
+    """
+    Load a model from MLflow, cached process-wide per (user, version, stage).
+
+    Services are constructed per request, so without this every request
+    re-deserializes the pipeline from the registry. Training flows call
+    invalidate_model_cache after publishing a new model.
+
+    Args:
+        user_id: User identifier
+        version: Model version
+        stage: Model stage
+
+    Returns:
+        Loaded ExpenseCategorizer
+    """
+    key = (user_id, version, stage)
+    with _model_cache_lock:
+        model = _model_cache.get(key)
+        if model is not None:
+            logger.debug(
+                'Model cache hit', extra={'user_id': user_id}
+            )
+            return model
+        load_lock = _model_load_locks.setdefault(key, threading.Lock())
+
+    # The registry fetch happens outside the cache lock so a cold load
+    # for one key never blocks cache hits for others; the per-key lock
+    # still collapses concurrent first requests into a single load
+    with load_lock:
+        with _model_cache_lock:
+            model = _model_cache.get(key)
+        if model is not None:
+            return model
+
+        logger.debug('Model cache miss', extra={'user_id': user_id})
+        model = ExpenseCategorizer.load_from_mlflow(
+            user_id=user_id, version=version, stage=stage
+        )
+        with _model_cache_lock:
+            _model_cache[key] = model
+            _model_load_locks.pop(key, None)
+        return model
+
+
+def invalidate_model_cache(user_id: Optional[str] = None) -> None:
+    """
+    Evict cached models so the next inference reloads them.
+
+    Args:
+        user_id: Evict only this user's models, or everything if None
+    """
+    with _model_cache_lock:
+        if user_id is None:
+            _model_cache.clear()
+        else:
+            for key in [k for k in _model_cache if k[0] == user_id]:
+                del _model_cache[key]
+
+
+@lru_cache(maxsize=1024)
+def _get_feature_engineer(user_id: str) -> FeatureEngineering:
+    """
+    Process-wide feature pipeline per user.
+
+    The instance is shared across concurrent requests: transform is
+    read-only once fitted, so no per-request construction or refit is
+    needed. RetrainingService clears the cache after persisting a
+    newly fitted pipeline.
+
+    Args:
+        user_id: User identifier
+
+    Returns:
+        The user's persisted pipeline, or an unfitted instance
+    """
+    return FeatureEngineering.load_or_new(user_id)
+
 
 class InferenceService:
     """
@@ -33,6 +147,11 @@ class InferenceService:
         self.explainer = ExplainableAI(user_id)
         self.model: Optional[ExpenseCategorizer] = None
         self.fe_pipeline: Optional[FeatureEngineering] = None
+        # Reused for single-expense inference to avoid rebuilding a
+        # 1-row DataFrame (Index + BlockManager) on every request
+        self._input_template = pd.DataFrame(
+            {'merchant': [''], 'amount': [0.0], 'date': ['']}
+        )
 
     def load_model(
         self,
@@ -50,11 +169,12 @@ class InferenceService:
             True if loaded successfully, False if model not found
         """
         try:
-            self.model = ExpenseCategorizer.load_from_mlflow(
-                user_id=self.user_id,
-                version=version,
-                stage=stage,
+            self.model = _load_model_cached(
+                self.user_id, version, stage
             )
+            fe_pipeline = _get_feature_engineer(self.user_id)
+            if fe_pipeline.fitted:
+                self.fe_pipeline = fe_pipeline
             logger.info(f'Loaded model for user {self.user_id}')
             return True
         except Exception as e:
@@ -88,19 +208,12 @@ class InferenceService:
 
         # Prepare input
         expense_date = date if date else datetime.now().isoformat()
-        input_df = pd.DataFrame(
-            [
-                {
-                    'merchant': merchant,
-                    'amount': amount,
-                    'date': expense_date,
-                }
-            ]
-        )
 
         # Try ML prediction first
         if self.model is not None:
             try:
+                input_df = self._input_template
+                input_df.iloc[0] = (merchant, amount, expense_date)
                 # Engineer features
                 if self.fe_pipeline:
                     X = self.fe_pipeline.transform(input_df)
@@ -191,6 +304,150 @@ class InferenceService:
             'feature_quality': 0.5,  # Default for cold-start
         }
 
+    def predict_batch(
+        self,
+        expenses: List[Dict[str, Any]],
+        top_k: int = 3,
+    ) -> Dict[str, Any]:
+        """
+        Predict categories for several expenses in one model call.
+
+        Feature engineering, feature-quality assessment, and the model
+        forward pass each run once over the whole batch; per-expense
+        work is limited to confidence calibration and explanations.
+
+        Args:
+            expenses: List of dicts with merchant, amount, and optional
+                date and notes
+            top_k: Number of predictions to return per expense
+
+        Returns:
+            Dictionary with per-expense results and total inference time
+        """
+        start_time = time.time()
+        now_iso = datetime.now().isoformat()
+
+        if self.model is not None:
+            try:
+                input_df = pd.DataFrame.from_records(
+                    [
+                        {
+                            'merchant': expense['merchant'],
+                            'amount': expense['amount'],
+                            'date': expense.get('date') or now_iso,
+                        }
+                        for expense in expenses
+                    ]
+                )
+
+                if self.fe_pipeline:
+                    X = self.fe_pipeline.transform(input_df)
+                else:
+                    X = pd.concat(
+                        [
+                            self._create_basic_features(
+                                expense['merchant'],
+                                expense['amount'],
+                                expense.get('notes'),
+                            )
+                            for expense in expenses
+                        ],
+                        ignore_index=True,
+                    )
+
+                feature_quality = self.confidence_scorer.assess_feature_quality(
+                    X
+                )
+
+                # One forward pass for the whole batch
+                predictions = self.model.predict(X, top_k=top_k)
+
+                results = []
+                for expense, preds in zip(expenses, predictions):
+                    confidence_infos = self.confidence_scorer.score_batch(
+                        model_probabilities=[
+                            pred['confidence'] for pred in preds
+                        ],
+                        feature_quality=feature_quality,
+                        categories=[pred['category'] for pred in preds],
+                        features=X,
+                    )
+
+                    expense_results = []
+                    for pred, confidence_info in zip(
+                        preds, confidence_infos
+                    ):
+                        explanation_info = self.explainer.explain(
+                            prediction=pred['category'],
+                            confidence=confidence_info['confidence'],
+                            features=X,
+                            merchant=expense['merchant'],
+                            amount=expense['amount'],
+                            date=expense.get('date') or now_iso,
+                        )
+                        expense_results.append(
+                            {
+                                'category': pred['category'],
+                                'confidence': confidence_info[
+                                    'confidence'
+                                ],
+                                'confidence_pct': confidence_info[
+                                    'confidence_pct'
+                                ],
+                                'confidence_level': confidence_info[
+                                    'confidence_level'
+                                ],
+                                'explanation': explanation_info[
+                                    'short_explanation'
+                                ],
+                                'detailed_explanation': explanation_info[
+                                    'detailed_explanation'
+                                ],
+                                'contributing_factors': explanation_info[
+                                    'contributing_factors'
+                                ],
+                            }
+                        )
+
+                    results.append(
+                        {
+                            'predictions': expense_results,
+                            'cold_start': False,
+                            'feature_quality': feature_quality,
+                        }
+                    )
+
+                return {
+                    'results': results,
+                    'inference_time_ms': (time.time() - start_time)
+                    * 1000,
+                }
+
+            except Exception as e:
+                logger.error(
+                    f'Batch ML prediction failed: {e}', exc_info=True
+                )
+
+        # Fall back to rule-based per expense
+        logger.info(
+            f'Using cold-start batch prediction for user {self.user_id}'
+        )
+        results = [
+            {
+                'predictions': self._cold_start_predict(
+                    expense['merchant'], expense['amount'], top_k
+                ),
+                'cold_start': True,
+                'feature_quality': 0.5,
+            }
+            for expense in expenses
+        ]
+
+        return {
+            'results': results,
+            'inference_time_ms': (time.time() - start_time) * 1000,
+        }
+
     def _create_basic_features(
         self, merchant: str, amount: float, notes: Optional[str]
     ) -> pd.DataFrame:
@@ -213,30 +470,19 @@ class InferenceService:
     ) -> List[Dict[str, Any]]:
         """Rule-based predictions for cold-start."""
         merchant_lower = merchant.lower()
-        rules = []
-
-        # Define rules
-        if any(
-            kw in merchant_lower
-            for kw in ['restaurant', 'cafe', 'coffee', 'pizza']
-        ):
-            rules.append(
-                {'category': 'Food & Dining', 'confidence': 0.75}
-            )
 
-        if any(
-            kw in merchant_lower
-            for kw in ['grocery', 'market', 'supermarket']
-        ):
-            rules.append({'category': 'Groceries', 'confidence': 0.80})
-
-        if any(
-            kw in merchant_lower
-            for kw in ['uber', 'lyft', 'taxi', 'parking']
-        ):
-            rules.append(
-                {'category': 'Transportation', 'confidence': 0.75}
-            )
+        # Match all keywords in one scan, keeping the best confidence
+        # per category
+        matched: Dict[str, float] = {}
+        for match in _COLD_START_PATTERN.finditer(merchant_lower):
+            category, confidence = _COLD_START_KEYWORDS[match.group()]
+            if confidence > matched.get(category, 0.0):
+                matched[category] = confidence
+
+        rules = [
+            {'category': category, 'confidence': confidence}
+            for category, confidence in matched.items()
+        ]
 
         if not rules:
             rules = [
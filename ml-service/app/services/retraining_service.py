@@ -5,17 +5,16 @@ Handles incremental learning from user feedback and
 periodic model retraining.
 """
 
+import os
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-import mlflow
+import numpy as np
 import pandas as pd
-from sklearn.model_selection import train_test_split
+from pandas.util import hash_pandas_object
 
 from app.config.logger import logger
-from app.models.categorizer import ExpenseCategorizer
-from app.models.feature_engineering import FeatureEngineering
 from app.services.feedback_service import FeedbackService
 
 
@@ -38,7 +37,7 @@ class RetrainingService:
         """
         self.user_id = user_id
         self.feedback_service = FeedbackService(user_id)
-        self.feature_engineering = FeatureEngineering(user_id)
+        self.feature_engineering = None  # built lazily in retrain_model
         self.data_dir = Path('data') / 'training' / user_id
         self.data_dir.mkdir(parents=True, exist_ok=True)
 
@@ -49,6 +48,27 @@ class RetrainingService:
         Returns:
             Decision dictionary with should_retrain flag and reasons
         """
+        metadata = self._load_metadata()
+
+        # Fast path: if the feedback file is unchanged since the last
+        # check and the cached decision is under an hour old, skip the
+        # full stats pass (schedulers poll this frequently)
+        try:
+            stat = self.feedback_service.feedback_file.stat()
+            file_sig = [stat.st_mtime_ns, stat.st_size]
+        except OSError:
+            file_sig = None
+
+        cached = metadata.get('last_check')
+        if (
+            cached is not None
+            and file_sig is not None
+            and cached.get('file_sig') == file_sig
+        ):
+            checked_at = datetime.fromisoformat(cached['checked_at'])
+            if datetime.now() - checked_at < timedelta(hours=1):
+                return cached['decision']
+
         # Get feedback stats
         stats = self.feedback_service.get_feedback_stats()
 
@@ -73,7 +93,11 @@ class RetrainingService:
             should_retrain = True
 
         # Trigger 3: Scheduled retraining (every 7 days)
-        last_training = self._get_last_training_date()
+        last_training = None
+        if metadata.get('last_training_date'):
+            last_training = datetime.fromisoformat(
+                metadata['last_training_date']
+            )
         if last_training:
             days_since = (datetime.now() - last_training).days
             if days_since >= 7 and stats['total_predictions'] >= 50:
@@ -87,7 +111,7 @@ class RetrainingService:
             reasons.append('Initial training threshold reached')
             should_retrain = True
 
-        return {
+        decision = {
             'should_retrain': should_retrain,
             'reasons': reasons,
             'stats': stats,
@@ -96,6 +120,16 @@ class RetrainingService:
             ),
         }
 
+        if file_sig is not None:
+            metadata['last_check'] = {
+                'file_sig': file_sig,
+                'checked_at': datetime.now().isoformat(),
+                'decision': decision,
+            }
+            self._write_metadata(metadata)
+
+        return decision
+
     def retrain_model(
         self, experiment_name: str = 'expense_categorization'
     ) -> Dict[str, Any]:
@@ -108,8 +142,21 @@ class RetrainingService:
         Returns:
             Training results dictionary
         """
+        # Deferred so status/schedule endpoints never pay the MLflow
+        # and sklearn import cost
+        import mlflow
+        from sklearn.model_selection import train_test_split
+
+        from app.models.categorizer import ExpenseCategorizer
+        from app.models.feature_engineering import FeatureEngineering
+
         logger.info(f'Starting model retraining for user {self.user_id}')
 
+        if self.feature_engineering is None:
+            self.feature_engineering = FeatureEngineering.load_or_new(
+                self.user_id
+            )
+
         # Get training data from feedback
         training_data = self.feedback_service.get_training_data(
             min_confidence=0.0
@@ -132,21 +179,26 @@ class RetrainingService:
                 f'Merging {len(existing_data)} existing samples '
                 f'with {len(training_data)} new samples'
             )
-            # Combine and deduplicate
+            # Combine and deduplicate on a vectorized int64 composite
+            # hash instead of factorizing the object columns
             combined = pd.concat(
                 [existing_data, training_data], ignore_index=True
             )
-            combined = combined.drop_duplicates(
-                subset=['merchant', 'amount', 'date'], keep='last'
-            )
-            training_data = combined
+            keys = hash_pandas_object(
+                combined[['merchant', 'amount', 'date']], index=False
+            ).to_numpy()
+            # Keep the last occurrence of each key, preserving order
+            _, last_idx = np.unique(keys[::-1], return_index=True)
+            keep = np.sort(len(keys) - 1 - last_idx)
+            training_data = combined.iloc[keep]
 
         logger.info(
             f'Training with {len(training_data)} total samples'
         )
 
-        # Feature engineering
-        X = self.feature_engineering.transform(training_data)
+        # Feature engineering (refit on the merged data so new
+        # merchants enter the vocabulary)
+        X = self.feature_engineering.fit_transform(training_data)
         y = training_data['category']
 
         # Train/test split
@@ -184,9 +236,22 @@ class RetrainingService:
 
             logger.info(f'Model saved to MLflow: {model_uri}')
 
+        # Evict cached models and pipelines so inference picks up the
+        # new version
+        from app.services.inference_service import (
+            _get_feature_engineer,
+            invalidate_model_cache,
+        )
+
+        invalidate_model_cache(self.user_id)
+        _get_feature_engineer.cache_clear()
+
         # Save training data for next iteration
         self._save_training_data(training_data)
 
+        # Persist the fitted pipeline for the shared inference cache
+        self.feature_engineering.save_for_user()
+
         # Update last training timestamp
         self._update_last_training_date()
 
@@ -211,28 +276,52 @@ class RetrainingService:
         Returns:
             Last training datetime or None
         """
+        last_training = self._load_metadata().get('last_training_date')
+        if last_training:
+            return datetime.fromisoformat(last_training)
+        return None
+
+    def _update_last_training_date(self) -> None:
+        """Update last training date in metadata file."""
+        metadata = self._load_metadata()
+        metadata['last_training_date'] = datetime.now().isoformat()
+        # Any cached should_retrain decision predates the new model
+        metadata.pop('last_check', None)
+        self._write_metadata(metadata)
+
+    def _load_metadata(self) -> Dict[str, Any]:
+        """
+        Load training metadata.
+
+        Returns:
+            Metadata dictionary (empty if no file exists)
+        """
         metadata_file = self.data_dir / 'training_metadata.json'
         if not metadata_file.exists():
-            return None
+            return {}
 
         import json
 
         with open(metadata_file, 'r') as f:
-            metadata = json.load(f)
-            last_training = metadata.get('last_training_date')
-            if last_training:
-                return datetime.fromisoformat(last_training)
-        return None
+            return json.load(f)
 
-    def _update_last_training_date(self) -> None:
-        """Update last training date in metadata file."""
+    def _write_metadata(self, metadata: Dict[str, Any]) -> None:
+        """
+        Write training metadata.
+
+        Args:
+            metadata: Metadata dictionary
+        """
         import json
 
+        # Atomic replace keeps the file whole across crashes, so the
+        # mtime-based fast path above never reads a half-written state.
+        # No fsync: losing the very last write to a crash is acceptable.
         metadata_file = self.data_dir / 'training_metadata.json'
-        metadata = {'last_training_date': datetime.now().isoformat()}
-
-        with open(metadata_file, 'w') as f:
+        tmp_file = metadata_file.with_suffix('.json.tmp')
+        with open(tmp_file, 'w') as f:
             json.dump(metadata, f, indent=2)
+        os.replace(tmp_file, metadata_file)
 
     def _load_existing_training_data(self) -> Optional[pd.DataFrame]:
         """
@@ -241,12 +330,17 @@ class RetrainingService:
         Returns:
             DataFrame of existing training data or None
         """
-        training_file = self.data_dir / 'training_data.csv'
-        if not training_file.exists():
-            return None
+        training_file = self.data_dir / 'training_data.parquet'
+        legacy_file = self.data_dir / 'training_data.csv'
 
         try:
-            df = pd.read_csv(training_file)
+            if training_file.exists():
+                df = pd.read_parquet(training_file)
+            elif legacy_file.exists():
+                # Data saved before the Parquet switch
+                df = pd.read_csv(legacy_file)
+            else:
+                return None
             logger.info(
                 f'Loaded {len(df)} existing training samples '
                 f'for user {self.user_id}'
@@ -258,13 +352,22 @@ class RetrainingService:
 
     def _save_training_data(self, training_data: pd.DataFrame) -> None:
         """
-        Save training data to CSV.
+        Save training data to Parquet.
+
+        Columnar storage with snappy compression keeps the file small
+        and preserves dtypes, so reloading skips CSV tokenization and
+        type re-inference on every retrain.
 
         Args:
             training_data: Training DataFrame
         """
-        training_file = self.data_dir / 'training_data.csv'
-        training_data.to_csv(training_file, index=False)
+        # Write-to-temp + rename so readers never see a partial file
+        training_file = self.data_dir / 'training_data.parquet'
+        tmp_file = training_file.with_suffix('.parquet.tmp')
+        training_data.to_parquet(
+            tmp_file, compression='snappy', index=False
+        )
+        os.replace(tmp_file, training_file)
         logger.info(
             f'Saved {len(training_data)} training samples '
             f'for user {self.user_id}'
@@ -0,0 +1,21 @@
+"""
+Shared fixtures for the test suite.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+@pytest.fixture(scope='session')
+def client():
+    """
+    One TestClient for the whole session.
+
+    Entering the client context once means lifespan events fire a
+    single time, so individual tests don't pay app startup cost and
+    latency percentiles don't carry a first-call outlier.
+    """
+    with TestClient(app) as test_client:
+        yield test_client
@@ -3,17 +3,12 @@ Integration tests for recommendation API.
 """
 
 import pytest
-from fastapi.testclient import TestClient
-
-from app.main import app
-
-client = TestClient(app)
 
 
 class TestRecommendationAPI:
     """Integration tests for /api/ml/recommend endpoint."""
 
-    def test_get_recommendations_success(self):
+    def test_get_recommendations_success(self, client):
         """Test successful recommendation request."""
         payload = {
             'user_id': 'test_user_123',
@@ -47,7 +42,7 @@ class TestRecommendationAPI:
         assert 'explanation' in pred
         assert 0.0 <= pred['confidence'] <= 1.0
 
-    def test_get_recommendations_validation_error(self):
+    def test_get_recommendations_validation_error(self, client):
         """Test request validation errors."""
         payload = {
             'user_id': 'test_user',
@@ -59,7 +54,7 @@ class TestRecommendationAPI:
 
         assert response.status_code == 422  # Validation error
 
-    def test_get_recommendations_missing_fields(self):
+    def test_get_recommendations_missing_fields(self, client):
         """Test missing required fields."""
         payload = {
             'user_id': 'test_user',
@@ -70,7 +65,7 @@ class TestRecommendationAPI:
 
         assert response.status_code == 422
 
-    def test_get_recommendations_error_detection(self):
+    def test_get_recommendations_error_detection(self, client):
         """Test error detection in recommendations."""
         payload = {
             'user_id': 'test_user_456',
@@ -93,11 +88,57 @@ class TestRecommendationAPI:
             for err in data['errors']
         )
 
+    def test_get_batch_recommendations(self, client):
+        """Test batch recommendation request."""
+        payload = {
+            'user_id': 'test_user_batch',
+            'expenses': [
+                {
+                    'merchant': 'Starbucks',
+                    'amount': 12.50,
+                    'date': '2025-11-09T10:00:00',
+                },
+                {
+                    'merchant': 'Whole Foods Market',
+                    'amount': 85.30,
+                    'date': '2025-11-09T18:00:00',
+                },
+            ],
+            'top_k': 3,
+        }
+
+        response = client.post('/api/ml/recommend/batch', json=payload)
+
+        assert response.status_code == 200
+        data = response.json()
+
+        assert data['user_id'] == 'test_user_batch'
+        assert 'inference_time_ms' in data
+        assert len(data['results']) == 2
+
+        # Each expense gets its own predictions and errors
+        for result in data['results']:
+            assert len(result['predictions']) > 0
+            assert len(result['predictions']) <= 3
+            assert 'errors' in result
+            assert 'cold_start' in result
+
+    def test_get_batch_recommendations_empty(self, client):
+        """Test batch request with no expenses."""
+        payload = {
+            'user_id': 'test_user_batch',
+            'expenses': [],
+        }
+
+        response = client.post('/api/ml/recommend/batch', json=payload)
+
+        assert response.status_code == 422  # min_length violation
+
 
 class TestFeedbackAPI:
     """Integration tests for feedback API."""
 
-    def test_submit_accepted_feedback(self):
+    def test_submit_accepted_feedback(self, client):
         """Test submitting accepted feedback."""
         payload = {
             'user_id': 'test_user_789',
@@ -120,7 +161,7 @@ class TestFeedbackAPI:
         assert data['feedback_type'] == 'accepted'
         assert 'message' in data
 
-    def test_submit_corrected_feedback(self):
+    def test_submit_corrected_feedback(self, client):
         """Test submitting corrected feedback."""
         payload = {
             'user_id': 'test_user_790',
@@ -141,7 +182,7 @@ class TestFeedbackAPI:
 
         assert data['feedback_type'] == 'corrected'
 
-    def test_submit_feedback_invalid_type(self):
+    def test_submit_feedback_invalid_type(self, client):
         """Test invalid feedback type."""
         payload = {
             'user_id': 'test_user',
@@ -158,7 +199,7 @@ class TestFeedbackAPI:
 
         assert response.status_code == 400
 
-    def test_get_feedback_stats(self):
+    def test_get_feedback_stats(self, client):
         """Test getting feedback stats."""
         user_id = 'test_user_stats'
 
@@ -191,7 +232,7 @@ class TestFeedbackAPI:
 class TestRetrainingAPI:
     """Integration tests for retraining API."""
 
-    def test_get_retraining_status(self):
+    def test_get_retraining_status(self, client):
         """Test getting retraining status."""
         response = client.get('/api/ml/retraining/status/test_user_retrain')
 
@@ -203,7 +244,7 @@ class TestRetrainingAPI:
         assert 'retrain_reasons' in data
         assert isinstance(data['should_retrain'], bool)
 
-    def test_trigger_retraining_skip(self):
+    def test_trigger_retraining_skip(self, client):
         """Test trigger retraining when not needed."""
         payload = {
             'user_id': 'test_user_new',
@@ -219,7 +260,7 @@ class TestRetrainingAPI:
         assert data['status'] == 'skipped'
         assert data['triggered'] == False
 
-    def test_trigger_retraining_force(self):
+    def test_trigger_retraining_force(self, client):
         """Test forcing retraining."""
         payload = {
             'user_id': 'test_user_force',
@@ -238,7 +279,7 @@ class TestRetrainingAPI:
 class TestDashboardAPI:
     """Integration tests for dashboard API."""
 
-    def test_get_dashboard_summary(self):
+    def test_get_dashboard_summary(self, client):
         """Test getting dashboard summary."""
         response = client.get('/api/ml/dashboard/test_user_dash/summary')
 
@@ -251,7 +292,7 @@ class TestDashboardAPI:
         assert 'acceptance_rate' in data
         assert 'is_improving' in data
 
-    def test_get_full_dashboard(self):
+    def test_get_full_dashboard(self, client):
         """Test getting full dashboard."""
         response = client.get('/api/ml/dashboard/test_user_full?days=30')
 
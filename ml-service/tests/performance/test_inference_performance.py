@@ -7,24 +7,22 @@ Tests latency requirements from PRD:
 - Total Interaction: <300ms
 """
 
+import asyncio
+import concurrent.futures
 import time
-from statistics import median
 
+import httpx
 import numpy as np
 import pytest
-from fastapi.testclient import TestClient
 
 from app.main import app
 
-client = TestClient(app)
-
 
 class TestInferencePerformance:
     """Performance tests for inference API."""
 
-    def test_inference_latency_p95(self):
-        """Test that p95 inference latency < 200ms."""
-        latencies = []
+    def test_inference_latency_p95(self, client):
+        """Test that p95 inference latency < 200ms under concurrency."""
         num_requests = 100
 
         payload = {
@@ -35,20 +33,30 @@ class TestInferencePerformance:
             'top_k': 3,
         }
 
-        for _ in range(num_requests):
-            start = time.time()
+        def timed_request(_):
+            start = time.perf_counter_ns()
             response = client.post('/api/ml/recommend', json=payload)
-            end = time.time()
+            end = time.perf_counter_ns()
 
             assert response.status_code == 200
-            latency_ms = (end - start) * 1000
-            latencies.append(latency_ms)
+            return (end - start) / 1e6
 
-        # Calculate percentiles
-        p50 = median(latencies)
-        p95 = float(np.percentile(latencies, 95))
-        p99 = float(np.percentile(latencies, 99))
-        avg = sum(latencies) / len(latencies)
+        # Drive the requests from 8 threads so p95 reflects latency
+        # under realistic concurrency, not sequential round-trip time
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=8
+        ) as executor:
+            latencies = np.fromiter(
+                executor.map(timed_request, range(num_requests)),
+                dtype=np.float32,
+                count=num_requests,
+            )
+
+        # All percentiles in one partition pass
+        p50, p95, p99 = (
+            float(p) for p in np.percentile(latencies, [50, 95, 99])
+        )
+        avg = float(latencies.mean())
 
         print(f'\nInference Latency Metrics:')
         print(f'  Average: {avg:.2f}ms')
@@ -59,10 +67,38 @@ class TestInferencePerformance:
         # PRD requirement: p95 < 200ms
         assert p95 < 200, f'p95 latency {p95:.2f}ms exceeds 200ms requirement'
 
-    def test_recommendation_throughput(self):
+    @pytest.mark.sequential
+    def test_inference_latency_p95_sequential(self, client):
+        """Single-threaded latency reference for the concurrent test."""
+        num_requests = 100
+        latencies = np.empty(num_requests, dtype=np.float32)
+
+        payload = {
+            'user_id': 'perf_test_user',
+            'merchant': 'Starbucks',
+            'amount': 12.50,
+            'date': '2025-11-09T10:00:00',
+            'top_k': 3,
+        }
+
+        for i in range(num_requests):
+            start = time.perf_counter_ns()
+            response = client.post('/api/ml/recommend', json=payload)
+            end = time.perf_counter_ns()
+
+            assert response.status_code == 200
+            latencies[i] = (end - start) / 1e6
+
+        p95 = float(np.percentile(latencies, 95))
+
+        print(f'\nSequential p95: {p95:.2f}ms')
+
+        assert p95 < 200, f'p95 latency {p95:.2f}ms exceeds 200ms requirement'
+
+    @pytest.mark.asyncio
+    async def test_recommendation_throughput(self):
         """Test recommendation API throughput."""
         num_requests = 50
-        start_time = time.time()
 
         payload = {
             'user_id': 'throughput_test_user',
@@ -71,13 +107,24 @@ class TestInferencePerformance:
             'date': '2025-11-09T10:00:00',
         }
 
-        success_count = 0
-        for _ in range(num_requests):
-            response = client.post('/api/ml/recommend', json=payload)
-            if response.status_code == 200:
-                success_count += 1
-
-        elapsed = time.time() - start_time
+        # Overlap requests in one event loop so the measurement reflects
+        # server throughput rather than sequential round-trip time
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url='http://testserver'
+        ) as async_client:
+            start_time = time.perf_counter()
+            responses = await asyncio.gather(
+                *(
+                    async_client.post('/api/ml/recommend', json=payload)
+                    for _ in range(num_requests)
+                )
+            )
+            elapsed = time.perf_counter() - start_time
+
+        success_count = sum(
+            1 for response in responses if response.status_code == 200
+        )
         requests_per_second = num_requests / elapsed
 
         print(f'\nThroughput Metrics:')
@@ -89,33 +136,38 @@ class TestInferencePerformance:
         assert success_count == num_requests
         assert requests_per_second > 10, 'Throughput too low'
 
-    def test_feedback_submission_performance(self):
+    def test_feedback_submission_performance(self, client):
         """Test feedback submission performance."""
-        latencies = []
         num_requests = 50
+        latencies = np.empty(num_requests, dtype=np.float32)
+
+        # Template built once; only the per-iteration fields mutate so
+        # dict and f-string allocation stay out of the timed region
+        payload = {
+            'user_id': 'perf_feedback_user',
+            'expense_id': '',
+            'merchant': 'Test',
+            'amount': 0.0,
+            'date': '2025-11-09T10:00:00',
+            'predicted_category': 'Food & Dining',
+            'confidence': 0.8,
+            'feedback_type': 'accepted',
+        }
+        expense_ids = [f'exp_{i}' for i in range(num_requests)]
 
         for i in range(num_requests):
-            payload = {
-                'user_id': 'perf_feedback_user',
-                'expense_id': f'exp_{i}',
-                'merchant': 'Test',
-                'amount': 10.0 + i,
-                'date': '2025-11-09T10:00:00',
-                'predicted_category': 'Food & Dining',
-                'confidence': 0.8,
-                'feedback_type': 'accepted',
-            }
+            payload['expense_id'] = expense_ids[i]
+            payload['amount'] = 10.0 + i
 
-            start = time.time()
+            start = time.perf_counter_ns()
             response = client.post('/api/ml/feedback/submit', json=payload)
-            end = time.time()
+            end = time.perf_counter_ns()
 
             assert response.status_code == 201
-            latency_ms = (end - start) * 1000
-            latencies.append(latency_ms)
+            latencies[i] = (end - start) / 1e6
 
         p95 = float(np.percentile(latencies, 95))
-        avg = sum(latencies) / len(latencies)
+        avg = float(latencies.mean())
 
         print(f'\nFeedback Submission Latency:')
         print(f'  Average: {avg:.2f}ms')
@@ -124,22 +176,21 @@ class TestInferencePerformance:
         # Should be fast (write to file)
         assert p95 < 100, 'Feedback submission too slow'
 
-    def test_dashboard_load_time(self):
+    def test_dashboard_load_time(self, client):
         """Test dashboard load time."""
-        latencies = []
         num_requests = 20
+        latencies = np.empty(num_requests, dtype=np.float32)
 
-        for _ in range(num_requests):
-            start = time.time()
+        for i in range(num_requests):
+            start = time.perf_counter_ns()
             response = client.get('/api/ml/dashboard/perf_dash_user/summary')
-            end = time.time()
+            end = time.perf_counter_ns()
 
             assert response.status_code == 200
-            latency_ms = (end - start) * 1000
-            latencies.append(latency_ms)
+            latencies[i] = (end - start) / 1e6
 
         p95 = float(np.percentile(latencies, 95))
-        avg = sum(latencies) / len(latencies)
+        avg = float(latencies.mean())
 
         print(f'\nDashboard Load Time:')
         print(f'  Average: {avg:.2f}ms')
@@ -152,9 +203,8 @@ class TestInferencePerformance:
 class TestConcurrency:
     """Test concurrent request handling."""
 
-    def test_concurrent_recommendations(self):
+    def test_concurrent_recommendations(self, client):
         """Test handling concurrent recommendation requests."""
-        import concurrent.futures
 
         def make_request(user_id):
             payload = {
@@ -187,15 +237,15 @@ class TestConcurrency:
 class TestLoadTesting:
     """Load testing (marked as slow, run separately)."""
 
-    def test_sustained_load(self):
+    def test_sustained_load(self, client):
         """Test sustained load over time."""
         duration_seconds = 60
         target_rps = 20  # Requests per second
         total_requests = duration_seconds * target_rps
 
-        start_time = time.time()
+        start_time = time.perf_counter()
         success_count = 0
-        latencies = []
+        latencies = np.empty(total_requests, dtype=np.float32)
 
         payload = {
             'user_id': 'load_test_user',
@@ -205,22 +255,22 @@ class TestLoadTesting:
         }
 
         for i in range(total_requests):
-            request_start = time.time()
+            request_start = time.perf_counter_ns()
             response = client.post('/api/ml/recommend', json=payload)
-            request_end = time.time()
+            request_end = time.perf_counter_ns()
 
             if response.status_code == 200:
                 success_count += 1
 
-            latencies.append((request_end - request_start) * 1000)
+            latencies[i] = (request_end - request_start) / 1e6
 
             # Rate limiting to achieve target RPS
-            elapsed = time.time() - start_time
+            elapsed = time.perf_counter() - start_time
             expected_elapsed = (i + 1) / target_rps
             if elapsed < expected_elapsed:
                 time.sleep(expected_elapsed - elapsed)
 
-        total_time = time.time() - start_time
+        total_time = time.perf_counter() - start_time
         actual_rps = total_requests / total_time
         p95 = float(np.percentile(latencies, 95))
 
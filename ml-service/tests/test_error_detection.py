@@ -8,170 +8,186 @@ from datetime import datetime, timedelta
 
 from app.services.error_detection import ErrorDetectionService
 
+# Frozen clock so fixture frames are deterministic and can be built
+# once per module instead of once per test
+_NOW = datetime(2025, 1, 1)
+_NOW_ISO = _NOW.isoformat()
+_YESTERDAY = _NOW - timedelta(days=1)
+
+
+@pytest.fixture(scope='module')
+def food_history():
+    """History of normal Food & Dining amounts."""
+    return pd.DataFrame({
+        'category': ['Food & Dining'] * 10,
+        'amount': [10, 12, 15, 11, 13, 14, 12, 11, 10, 13],
+        'merchant': ['Starbucks'] * 10,
+        'date': [_NOW_ISO] * 10,
+    })
+
+
+@pytest.fixture(scope='module')
+def shopping_history():
+    """History of recent Shopping expenses at one merchant."""
+    return pd.DataFrame({
+        'category': ['Shopping'] * 5,
+        'amount': [30, 35, 32, 31, 33],
+        'merchant': ['Amazon'] * 5,
+        'date': [
+            (_YESTERDAY - timedelta(days=i)).isoformat()
+            for i in range(5)
+        ],
+    })
+
+
+@pytest.fixture(scope='module')
+def recent_history():
+    """Small mixed-merchant history within the duplicate window."""
+    return pd.DataFrame({
+        'merchant': ['Starbucks', 'Amazon', 'Uber'],
+        'amount': [12.50, 45.00, 25.00],
+        'date': [
+            _YESTERDAY.isoformat(),
+            (_YESTERDAY - timedelta(days=2)).isoformat(),
+            (_YESTERDAY - timedelta(days=3)).isoformat(),
+        ],
+    })
+
+
+@pytest.fixture
+def service():
+    """Fresh service so per-history caches don't leak across tests."""
+    return ErrorDetectionService('test_user')
+
 
 class TestErrorDetectionService:
     """Test suite for ErrorDetectionService."""
 
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.service = ErrorDetectionService('test_user')
-
-    def test_detect_amount_outlier(self):
+    @pytest.mark.parametrize(
+        'amount,expect_outlier',
+        [
+            (100.0, True),  # Way higher than average (~12)
+            (12.0, False),  # Normal amount
+        ],
+    )
+    def test_detect_amount_outlier(
+        self, service, food_history, amount, expect_outlier
+    ):
         """Test amount outlier detection."""
-        # Create history with normal amounts
-        history = pd.DataFrame({
-            'category': ['Food & Dining'] * 10,
-            'amount': [10, 12, 15, 11, 13, 14, 12, 11, 10, 13],
-            'merchant': ['Starbucks'] * 10,
-            'date': [datetime.now().isoformat()] * 10,
-        })
-
-        # Test outlier amount
-        outlier = self.service._detect_amount_outlier(
-            amount=100.0,  # Way higher than average (~12)
+        outlier = service._detect_amount_outlier(
+            amount=amount,
             category='Food & Dining',
-            history=history,
+            history=food_history,
         )
 
-        assert outlier is not None
-        assert outlier['type'] == 'amount_outlier'
-        assert outlier['severity'] == 'warning'
+        if expect_outlier:
+            assert outlier is not None
+            assert outlier['type'] == 'amount_outlier'
+            assert outlier['severity'] == 'warning'
+        else:
+            assert outlier is None
 
-    def test_detect_amount_outlier_no_outlier(self):
-        """Test no outlier detected for normal amount."""
+    def test_detect_amount_outlier_null_category(self, service):
+        """Rows with a null category are skipped, not fatal."""
         history = pd.DataFrame({
-            'category': ['Food & Dining'] * 10,
-            'amount': [10, 12, 15, 11, 13, 14, 12, 11, 10, 13],
-            'merchant': ['Starbucks'] * 10,
-            'date': [datetime.now().isoformat()] * 10,
+            'category': ['Food & Dining'] * 4 + [None],
+            'amount': [10, 12, 11, 13, 99],
+            'merchant': ['Starbucks'] * 5,
+            'date': [_NOW_ISO] * 5,
         })
 
-        outlier = self.service._detect_amount_outlier(
-            amount=12.0,  # Normal amount
+        outlier = service._detect_amount_outlier(
+            amount=100.0,
             category='Food & Dining',
             history=history,
         )
 
-        assert outlier is None
+        assert outlier is not None
+        assert outlier['type'] == 'amount_outlier'
 
-    def test_detect_duplicate(self):
+    def test_detect_duplicate(self, service, recent_history):
         """Test duplicate expense detection."""
-        yesterday = datetime.now() - timedelta(days=1)
-
-        history = pd.DataFrame({
-            'merchant': ['Starbucks', 'Amazon', 'Uber'],
-            'amount': [12.50, 45.00, 25.00],
-            'date': [
-                yesterday.isoformat(),
-                (yesterday - timedelta(days=2)).isoformat(),
-                (yesterday - timedelta(days=3)).isoformat(),
-            ],
-        })
-
         # Test duplicate (same merchant, similar amount, within 7 days)
-        duplicate = self.service._detect_duplicate(
+        duplicate = service._detect_duplicate(
             merchant='Starbucks',
             amount=12.50,
-            date=datetime.now().isoformat(),
-            history=history,
+            date=_NOW_ISO,
+            history=recent_history,
         )
 
         assert duplicate is not None
         assert duplicate['type'] == 'duplicate'
 
-    def test_detect_missing_receipt(self):
-        """Test missing receipt detection."""
-        errors = self.service._detect_missing_data(
-            merchant='Expensive Store',
-            amount=150.0,  # Over $100
-            category='Shopping',
-            notes='Bought something',
-            receipt_attached=False,  # No receipt
-        )
-
-        # Should warn about missing receipt
-        receipt_error = next(
-            (e for e in errors if e['type'] == 'missing_receipt'),
-            None,
-        )
-        assert receipt_error is not None
-        assert receipt_error['severity'] == 'info'
-
-    def test_detect_missing_notes(self):
-        """Test missing notes detection."""
-        errors = self.service._detect_missing_data(
+    @pytest.mark.parametrize(
+        'amount,notes,receipt_attached,expected_type',
+        [
+            # Over $100 with no receipt
+            (150.0, 'Bought something', False, 'missing_receipt'),
+            # Over $50 with no notes
+            (75.0, None, True, 'missing_notes'),
+        ],
+    )
+    def test_detect_missing_data(
+        self, service, amount, notes, receipt_attached, expected_type
+    ):
+        """Test missing receipt and notes detection."""
+        errors = service._detect_missing_data(
             merchant='Some Store',
-            amount=75.0,  # Over $50
+            amount=amount,
             category='Shopping',
-            notes=None,  # No notes
-            receipt_attached=True,
+            notes=notes,
+            receipt_attached=receipt_attached,
         )
 
-        # Should suggest adding notes
-        notes_error = next(
-            (e for e in errors if e['type'] == 'missing_notes'),
-            None,
-        )
-        assert notes_error is not None
+        error = service.index_errors_by_type(errors).get(expected_type)
+        assert error is not None
+        assert error['severity'] == 'info'
 
-    def test_detect_unusual_time(self):
+    def test_detect_unusual_time(self, service):
         """Test unusual time detection."""
         # Large transaction at 3 AM
-        date_3am = datetime.now().replace(hour=3, minute=0)
+        date_3am = _NOW.replace(hour=3, minute=0)
 
-        errors = self.service._detect_unusual_patterns(
+        errors = service._detect_unusual_patterns(
             merchant='Some Store',
             amount=600.0,  # Large amount
             date=date_3am.isoformat(),
             category='Shopping',
         )
 
-        unusual_time_error = next(
-            (e for e in errors if e['type'] == 'unusual_time'),
-            None,
+        unusual_time_error = service.index_errors_by_type(errors).get(
+            'unusual_time'
         )
         assert unusual_time_error is not None
         assert unusual_time_error['severity'] == 'warning'
 
-    def test_fuzzy_match(self):
+    def test_fuzzy_match(self, service):
         """Test fuzzy string matching."""
         # Exact match
-        assert self.service._fuzzy_match('starbucks', 'starbucks') == 1.0
+        assert service._fuzzy_match('starbucks', 'starbucks') == 1.0
 
         # Substring match
-        score1 = self.service._fuzzy_match('starbucks', 'starbucks coffee')
+        score1 = service._fuzzy_match('starbucks', 'starbucks coffee')
         assert score1 > 0.8
 
         # Similar strings
-        score2 = self.service._fuzzy_match('amazon', 'amzn')
+        score2 = service._fuzzy_match('amazon', 'amzn')
         assert 0.0 < score2 < 1.0
 
         # Completely different
-        score3 = self.service._fuzzy_match('starbucks', 'uber')
+        score3 = service._fuzzy_match('starbucks', 'uber')
         assert score3 < 0.5
 
-    def test_detect_errors_comprehensive(self):
+    def test_detect_errors_comprehensive(self, service, shopping_history):
         """Test comprehensive error detection."""
-        yesterday = datetime.now() - timedelta(days=1)
-
-        history = pd.DataFrame({
-            'category': ['Shopping'] * 5,
-            'amount': [30, 35, 32, 31, 33],
-            'merchant': ['Amazon'] * 5,
-            'date': [
-                (yesterday - timedelta(days=i)).isoformat()
-                for i in range(5)
-            ],
-        })
-
-        errors = self.service.detect_errors(
+        errors = service.detect_errors(
             merchant='Amazon',
             amount=150.0,  # Outlier
             category='Shopping',
-            date=datetime.now().isoformat(),
+            date=_NOW_ISO,
             notes=None,  # Missing notes
             receipt_attached=False,  # Missing receipt
-            user_expense_history=history,
+            user_expense_history=shopping_history,
         )
 
         assert len(errors) > 0
@@ -2,35 +2,31 @@
 Unit tests for feedback service.
 """
 
-import tempfile
-from pathlib import Path
-
 import pytest
 
 from app.services.feedback_service import FeedbackService
 
+_USER_ID = 'test_user_123'
+
+
+@pytest.fixture
+def service(tmp_path):
+    """Service writing under a pytest-managed temp directory."""
+    service = FeedbackService(_USER_ID)
+    # Override feedback directory to temp; pytest cleans tmp_path
+    # trees in bulk, so tests skip the per-test rmtree
+    service.feedback_dir = tmp_path / 'feedback' / _USER_ID
+    service.feedback_dir.mkdir(parents=True, exist_ok=True)
+    service.feedback_file = service.feedback_dir / 'feedback.jsonl'
+    return service
+
 
 class TestFeedbackService:
     """Test suite for FeedbackService."""
 
-    def setup_method(self):
-        """Set up test fixtures with temporary directory."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.user_id = 'test_user_123'
-        self.service = FeedbackService(self.user_id)
-        # Override feedback directory to temp
-        self.service.feedback_dir = Path(self.temp_dir) / 'feedback' / self.user_id
-        self.service.feedback_dir.mkdir(parents=True, exist_ok=True)
-        self.service.feedback_file = self.service.feedback_dir / 'feedback.jsonl'
-
-    def teardown_method(self):
-        """Clean up temp directory."""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-
-    def test_submit_accepted_feedback(self):
+    def test_submit_accepted_feedback(self, service):
         """Test submitting accepted feedback."""
-        feedback_id = self.service.submit_feedback(
+        feedback_id = service.submit_feedback(
             expense_id='exp_123',
             merchant='Starbucks',
             amount=12.50,
@@ -47,11 +43,11 @@ class TestFeedbackService:
         assert len(feedback_id) > 0
 
         # Verify file was created
-        assert self.service.feedback_file.exists()
+        assert service.feedback_file.exists()
 
-    def test_submit_corrected_feedback(self):
+    def test_submit_corrected_feedback(self, service):
         """Test submitting corrected feedback."""
-        feedback_id = self.service.submit_feedback(
+        feedback_id = service.submit_feedback(
             expense_id='exp_124',
             merchant='Amazon',
             amount=45.00,
@@ -67,24 +63,24 @@ class TestFeedbackService:
         assert feedback_id is not None
 
         # Load and verify
-        records = self.service._load_feedback()
+        records = service._load_feedback()
         assert len(records) == 1
         assert records[0]['feedback_type'] == 'corrected'
         assert records[0]['actual_category'] == 'Business Expenses'
         assert records[0]['is_correct'] == False
 
-    def test_get_feedback_stats_empty(self):
+    def test_get_feedback_stats_empty(self, service):
         """Test stats with no feedback."""
-        stats = self.service.get_feedback_stats()
+        stats = service.get_feedback_stats()
 
         assert stats['total_predictions'] == 0
         assert stats['acceptance_rate'] == 0.0
         assert len(stats['most_corrected_categories']) == 0
 
-    def test_get_feedback_stats(self):
+    def test_get_feedback_stats(self, service):
         """Test stats calculation."""
         # Submit multiple feedback records
-        self.service.submit_feedback(
+        service.submit_feedback(
             expense_id='exp_1',
             merchant='Starbucks',
             amount=10.0,
@@ -95,7 +91,7 @@ class TestFeedbackService:
             model_version='v1',
             feedback_type='accepted',
         )
-        self.service.submit_feedback(
+        service.submit_feedback(
             expense_id='exp_2',
             merchant='Amazon',
             amount=50.0,
@@ -106,7 +102,7 @@ class TestFeedbackService:
             model_version='v1',
             feedback_type='accepted',
         )
-        self.service.submit_feedback(
+        service.submit_feedback(
             expense_id='exp_3',
             merchant='Uber',
             amount=25.0,
@@ -119,17 +115,17 @@ class TestFeedbackService:
             actual_category='Transportation',
         )
 
-        stats = self.service.get_feedback_stats()
+        stats = service.get_feedback_stats()
 
         assert stats['total_predictions'] == 3
         assert stats['accepted_count'] == 2
         assert stats['corrected_count'] == 1
         assert stats['acceptance_rate'] == pytest.approx(66.67, rel=0.1)
 
-    def test_get_training_data(self):
+    def test_get_training_data(self, service):
         """Test extracting training data."""
         # Submit feedback with actual categories
-        self.service.submit_feedback(
+        service.submit_feedback(
             expense_id='exp_1',
             merchant='Starbucks',
             amount=10.0,
@@ -140,7 +136,7 @@ class TestFeedbackService:
             model_version='v1',
             feedback_type='accepted',
         )
-        self.service.submit_feedback(
+        service.submit_feedback(
             expense_id='exp_2',
             merchant='Uber',
             amount=25.0,
@@ -153,7 +149,7 @@ class TestFeedbackService:
             actual_category='Transportation',
         )
 
-        training_df = self.service.get_training_data()
+        training_df = service.get_training_data()
 
         assert len(training_df) == 2
         assert 'category' in training_df.columns
@@ -161,11 +157,11 @@ class TestFeedbackService:
         assert training_df.iloc[0]['category'] == 'Food & Dining'
         assert training_df.iloc[1]['category'] == 'Transportation'
 
-    def test_get_feedback_history(self):
+    def test_get_feedback_history(self, service):
         """Test getting feedback history."""
         # Submit multiple records
         for i in range(5):
-            self.service.submit_feedback(
+            service.submit_feedback(
                 expense_id=f'exp_{i}',
                 merchant='Test Merchant',
                 amount=10.0 + i,
@@ -177,15 +173,15 @@ class TestFeedbackService:
                 feedback_type='accepted',
             )
 
-        history = self.service.get_feedback_history(limit=3)
+        history = service.get_feedback_history(limit=3)
 
         assert len(history) == 3
         # Should be sorted by timestamp descending (most recent first)
         assert history[0]['expense_id'] == 'exp_4'
 
-    def test_clear_feedback(self):
+    def test_clear_feedback(self, service):
         """Test clearing feedback."""
-        self.service.submit_feedback(
+        service.submit_feedback(
             expense_id='exp_1',
             merchant='Test',
             amount=10.0,
@@ -197,8 +193,8 @@ class TestFeedbackService:
             feedback_type='accepted',
         )
 
-        assert self.service.feedback_file.exists()
+        assert service.feedback_file.exists()
 
-        self.service.clear_feedback()
+        service.clear_feedback()
 
-        assert not self.service.feedback_file.exists()
+        assert not service.feedback_file.exists()